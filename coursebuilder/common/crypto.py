@@ -88,6 +88,10 @@ ENCRYPTION_SECRET = config.ConfigProperty(
 
 class EncryptionManager(object):
 
+    # Keyed HMAC digester for the current XSRF secret, as (secret, digester).
+    # It is copied for every digest so the key is not re-derived each time.
+    _hmac_prototype = (None, None)
+
     @classmethod
     def init_secret_if_none(cls, cfg, length):
 
@@ -129,8 +133,12 @@ class EncryptionManager(object):
     @classmethod
     def hmac(cls, components):
         """Generate an XSRF over the array of components strings."""
-        secret = cls._get_hmac_secret()
-        digester = hmac.new(str(secret))
+        secret = str(cls._get_hmac_secret())
+        prototype_secret, prototype = cls._hmac_prototype
+        if prototype is None or prototype_secret != secret:
+            prototype = hmac.new(secret)
+            cls._hmac_prototype = (secret, prototype)
+        digester = prototype.copy()
         for component in components:
             digester.update(component)
         return digester.digest()
@@ -202,9 +210,9 @@ class XsrfTokenManager(object):
         # Round time to seconds.
         issued_on = long(issued_on)
 
-        digest = EncryptionManager.hmac(
+        digest = EncryptionManager.hmac([
             cls.DELIMITER_PRIVATE.join([
-                str(user_id), str(action_id), str(issued_on)]))
+                str(user_id), str(action_id), str(issued_on)])])
         token = '%s%s%s' % (
             issued_on, cls.DELIMITER_PUBLIC, base64.urlsafe_b64encode(digest))
 
@@ -217,9 +225,11 @@ class XsrfTokenManager(object):
     @classmethod
     def is_xsrf_token_valid(cls, token, action):
         """Validate a given XSRF token by retrieving it from memcache."""
+        if not token or not isinstance(token, basestring):
+            return False
         try:
             parts = token.split(cls.DELIMITER_PUBLIC)
-            if len(parts) != 2:
+            if len(parts) != 2 or not parts[0].isdigit():
                 return False
 
             issued_on = long(parts[0])
@@ -606,6 +606,10 @@ class CourseIndex(object):
             return self._get_course_for_path_linear(path)
 
 
+# Scheme characters as accepted by urlparse, followed by ':'.
+_URL_SCHEME_RE = re.compile(r'^[a-zA-Z0-9+.-]+:')
+
+
 def debug(message):
     if ApplicationContext.DEBUG_INFO:
         logging.info(message)
@@ -665,6 +669,7 @@ class ApplicationContext(object):
         self._fs = fs
         self._raw = raw
         self._cached_environ = None
+        self._slug_with_trailing_slash = None
 
         self._locale_threadlocal = threading.local()
 
@@ -755,6 +760,22 @@ class ApplicationContext(object):
     def get_slug(self):
         return self.slug
 
+    @property
+    def slug_with_trailing_slash(self):
+        """Returns the slug with '/' appended, unless it already ends so."""
+        if self._slug_with_trailing_slash is None:
+            slug = self.get_slug()
+            if not slug.endswith('/'):
+                slug += '/'
+            self._slug_with_trailing_slash = slug
+        return self._slug_with_trailing_slash
+
+    @property
+    def has_slug(self):
+        """Whether URLs of this context need a prefix other than '/'."""
+        slug = self.get_slug()
+        return bool(slug) and slug != '/'
+
     def get_config_filename(self):
         """Returns absolute location of a course configuration file."""
         filename = abspath(self.get_home_folder(), GCB_CONFIG_FILENAME)
@@ -838,17 +859,23 @@ class ApplicationContext(object):
 
     @classmethod
     def is_absolute_url(cls, url):
-        return bool(urlparse.urlparse(url).scheme)
+        """Checks if url has a scheme, the same way urlparse() decides it."""
+        match = _URL_SCHEME_RE.match(url)
+        if not match:
+            return False
+        # A 'host:1234' url has a port number, not a scheme; urlparse() makes
+        # an exception for the literal 'http' scheme, so 'http:123' has one.
+        if url[:match.end()] == 'http:':
+            return True
+        rest = url[match.end():]
+        return not rest or bool(rest.strip('0123456789'))
 
     def canonicalize_url(self, location):
         """Adds the current namespace URL prefix to the relative 'location'."""
-        is_relative = (
-            not self.is_absolute_url(location) and
-            not location.startswith(self.get_slug()))
-        has_slug = (
-            self.get_slug() and self.get_slug() != '/')
-        if is_relative and has_slug:
-            location = '%s%s' % (self.get_slug(), location)
+        slug = self.get_slug()
+        if (self.has_slug and not location.startswith(slug) and
+            not self.is_absolute_url(location)):
+            location = slug + location
         return location
 
 
@@ -23,15 +23,17 @@ import functools
 import logging
 import os
 import re
+import threading
 import urllib
-import urlparse
 
 import jinja2
 import sites
 import webapp2
+from webapp2_extras import i18n
 from webob import multidict
 
 import appengine_config
+from common import caching
 from common import jinja_utils
 from common import locales
 from common import resource
@@ -65,6 +67,13 @@ GUEST_LOCALE_COOKIE_MAX_AGE_SEC = 48 * 60 * 60  # 48 hours
 
 TRANSIENT_STUDENT = TransientStudent()
 
+# Holds the handler currently rendering a template on this thread; filters
+# installed once into the shared Jinja environments look it up here.
+_TEMPLATE_HANDLER_THREADLOCAL = threading.local()
+
+# How many templates of a read-write course are kept while serving a request.
+REQUEST_TEMPLATE_CACHE_SIZE = 50
+
 # Whether to output debug info into the page.
 CAN_PUT_DEBUG_INFO_INTO_PAGES = ConfigProperty(
     'gcb_can_put_debug_info_into_pages', bool, (
@@ -120,6 +129,74 @@ HUMAN_READABLE_DATE_FORMAT = '%Y-%m-%d'
 HUMAN_READABLE_TIME_FORMAT = '%H:%M:%S UTC'
 
 
+class ProcessScopedTemplateEnvironCache(caching.ProcessScopedSingleton):
+    """This class holds in-process cache of configured Jinja environments."""
+
+    def __init__(self):
+        self.environs = {}
+
+
+def _set_template_handler(handler):
+    """Binds the gcb_tags filter of this thread to handler, or unbinds it."""
+    _TEMPLATE_HANDLER_THREADLOCAL.handler = handler
+    _TEMPLATE_HANDLER_THREADLOCAL.gcb_tags = (
+        jinja_utils.get_gcb_tags_filter(handler) if handler else None)
+
+
+def _get_template_handler():
+    return getattr(_TEMPLATE_HANDLER_THREADLOCAL, 'handler', None)
+
+
+class _HandlerTemplate(object):
+    """Jinja template that binds its handler to gcb_tags while rendering.
+
+    Binding for the duration of render() only lets callers render the
+    template themselves without leaking the handler into the thread. The
+    binding in effect before is restored afterwards: a custom tag may
+    render a nested template while the enclosing page is being rendered.
+    """
+
+    def __init__(self, template, handler):
+        self._template = template
+        self._handler = handler
+
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+    def render(self, *args, **kwargs):
+        previous_handler = _get_template_handler()
+        _set_template_handler(self._handler)
+        try:
+            return self._template.render(*args, **kwargs)
+        finally:
+            _set_template_handler(previous_handler)
+
+
+def _gcb_tags(data):
+    """Applies gcb_tags filter on behalf of the handler rendering the page."""
+    gcb_tags = getattr(_TEMPLATE_HANDLER_THREADLOCAL, 'gcb_tags', None)
+    if gcb_tags is None:
+        logging.error('gcb_tags used with no handler rendering a template.')
+        return jinja2.utils.Markup(unicode(data))
+    return gcb_tags(data)
+
+
+class LazyXsrfToken(object):
+    """An XSRF token that is only created when a template renders it."""
+
+    def __init__(self, action):
+        self._action = action
+        self._token = None
+
+    def __unicode__(self):
+        if self._token is None:
+            self._token = XsrfTokenManager.create_xsrf_token(self._action)
+        return unicode(self._token)
+
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+
 class RESTHandlerMixin(object):
     """A mixin class to mark any handler as REST handler."""
     pass
@@ -176,22 +253,63 @@ class ReflectiveRequestHandler(object):
     Add instance methods named get_list(self), get_edit(self), post_save(self).
     These methods will now be called automatically based on the 'action'
     GET/POST parameter.
+
+    To change the allowed actions at runtime, use add_action(),
+    remove_action() and set_actions() rather than editing the lists in place;
+    dispatch checks against sets that these methods keep current.
     """
 
+    # Bumped whenever any handler's actions change; stale sets are rebuilt.
+    _actions_version = 0
+
     def create_xsrf_token(self, action):
         return XsrfTokenManager.create_xsrf_token(action)
 
+    @classmethod
+    def _actions_changed(cls):
+        ReflectiveRequestHandler._actions_version += 1
+
+    @classmethod
+    def add_action(cls, verb, action):
+        """Allows action for verb, which is 'get' or 'post'."""
+        getattr(cls, '%s_actions' % verb).append(action)
+        cls._actions_changed()
+
+    @classmethod
+    def remove_action(cls, verb, action):
+        """Disallows action for verb, which is 'get' or 'post'."""
+        getattr(cls, '%s_actions' % verb).remove(action)
+        cls._actions_changed()
+
+    @classmethod
+    def set_actions(cls, verb, actions):
+        """Replaces the list of actions allowed for verb."""
+        setattr(cls, '%s_actions' % verb, list(actions))
+        cls._actions_changed()
+
+    @classmethod
+    def _get_allowed_actions(cls, set_name, actions):
+        """Returns actions as a frozenset, cached on the class in set_name."""
+        cached = cls.__dict__.get(set_name)
+        if (cached is None or
+            cached[0] != ReflectiveRequestHandler._actions_version):
+            cached = (
+                ReflectiveRequestHandler._actions_version, frozenset(actions))
+            setattr(cls, set_name, cached)
+        return cached[1]
+
     def get(self):
         """Handles GET."""
         action = self.request.get('action')
         if not action:
             action = self.default_action
 
-        if action not in self.get_actions:
+        if action not in self._get_allowed_actions(
+                '_get_actions_set', self.get_actions):
             self.error(404)
             return
 
-        handler = getattr(self, 'get_%s' % action)
+        handler = getattr(self, 'get_%s' % action, None)
         if not handler:
             self.error(404)
             return
@@ -201,11 +319,12 @@ class ReflectiveRequestHandler(object):
     def post(self):
         """Handles POST."""
         action = self.request.get('action')
-        if not action or action not in self.post_actions:
+        if not action or action not in self._get_allowed_actions(
+                '_post_actions_set', self.post_actions):
             self.error(404)
             return
 
-        handler = getattr(self, 'post_%s' % action)
+        handler = getattr(self, 'post_%s' % action, None)
         if not handler:
             self.error(404)
             return
@@ -574,16 +693,13 @@ class ApplicationHandler(webapp2.RequestHandler):
     @classmethod
     def get_base_href(cls, handler):
         """Computes current course <base> href."""
-        base = handler.app_context.get_slug()
-        if not base.endswith('/'):
-            base = '%s/' % base
+        base = handler.app_context.slug_with_trailing_slash
+        if sites.ApplicationContext.is_absolute_url(base):
+            return base
 
         # For IE to work with the <base> tag, its href must be an absolute URL.
-        if not sites.ApplicationContext.is_absolute_url(base):
-            parts = urlparse.urlparse(handler.request.url)
-            base = urlparse.urlunparse(
-                (parts.scheme, parts.netloc, base, None, None, None))
-        return base
+        # The request's host_url is exactly its 'scheme://netloc' part.
+        return handler.request.host_url + base
 
     def render_template_to_html(self, template_values, template_file,
                                 additional_dirs=None):
@@ -591,8 +707,7 @@ class ApplicationHandler(webapp2.RequestHandler):
         models.MemcacheManager.begin_readonly()
         try:
             template = self.get_template(template_file, additional_dirs)
-            return jinja2.utils.Markup(
-                template.render(template_values, autoescape=True))
+            return jinja2.utils.Markup(template.render(template_values))
         finally:
             models.MemcacheManager.end_readonly()
             courses.Course.clear_current()
@@ -699,6 +814,36 @@ class CourseHandler(ApplicationHandler):
         super(CourseHandler, self).__init__(*args, **kwargs)
         self.course = None
         self.template_value = {}
+        self._environ_cache = None
+        self._is_course_admin = None
+        self._is_super_admin = None
+        self._is_read_write_course = None
+        self._request_template_environs = {}
+
+    def _environ(self):
+        """Returns course settings, loaded at most once per request/locale."""
+        locale = self.app_context.get_current_locale()
+        if self._environ_cache is None or self._environ_cache[0] != locale:
+            self._environ_cache = (locale, self.app_context.get_environ())
+        return self._environ_cache[1]
+
+    def _get_is_course_admin(self):
+        """Checks course admin rights once per request."""
+        if self._is_course_admin is None:
+            self._is_course_admin = Roles.is_course_admin(self.app_context)
+        return self._is_course_admin
+
+    def _get_is_super_admin(self):
+        """Checks super admin rights once per request."""
+        if self._is_super_admin is None:
+            self._is_super_admin = Roles.is_super_admin()
+        return self._is_super_admin
+
+    def _get_is_read_write_course(self):
+        """Checks the kind of course file system once per request."""
+        if self._is_read_write_course is None:
+            self._is_read_write_course = self.app_context.fs.is_read_write()
+        return self._is_read_write_course
 
     def get_user(self):
         """Get the current user."""
@@ -840,13 +985,12 @@ class CourseHandler(ApplicationHandler):
             'page_locale'] = self.app_context.get_current_locale()
         self.template_value['html_hooks'] = HtmlHooks(
             self.get_course(), prefs=prefs)
-        self.template_value['is_course_admin'] = Roles.is_course_admin(
-            self.app_context)
+        self.template_value['is_course_admin'] = self._get_is_course_admin()
         self.template_value['can_see_drafts'] = (
             custom_modules.can_see_drafts(self.app_context))
         self.template_value[
-            'is_read_write_course'] = self.app_context.fs.is_read_write()
-        self.template_value['is_super_admin'] = Roles.is_super_admin()
+            'is_read_write_course'] = self._get_is_read_write_course()
+        self.template_value['is_super_admin'] = self._get_is_super_admin()
         self.template_value[COURSE_BASE_KEY] = self.get_base_href(self)
         self.template_value['left_links'] = []
         for func in self.LEFT_LINKS:
@@ -862,7 +1006,7 @@ class CourseHandler(ApplicationHandler):
             prefs = models.StudentPreferencesDAO.load_or_default()
         self.template_value['student_preferences'] = prefs
 
-        if (Roles.is_course_admin(self.app_context) and
+        if (self._get_is_course_admin() and
             not appengine_config.PRODUCTION_MODE and
             prefs and prefs.show_jinja_context):
 
@@ -891,32 +1035,70 @@ class CourseHandler(ApplicationHandler):
                     'value': loc
                 } for loc in self.app_context.get_allowed_locales()]
             self.template_value['locale_xsrf_token'] = (
-                XsrfTokenManager.create_xsrf_token(
+                LazyXsrfToken(
                     StudentLocaleRESTHandler.XSRF_TOKEN_NAME))
             self.template_value['selected_locale'] = self.get_locale_for(
                 self.request, self.app_context, prefs=prefs)
 
-    def get_template(self, template_file, additional_dirs=None, prefs=None):
-        """Computes location of template files for the current namespace."""
-
-        _p = self.app_context.get_environ()
-        self.init_template_values(_p, prefs=prefs)
-        template_environ = self.app_context.get_template_environ(
-            self.app_context.get_current_locale(), additional_dirs)
-        template_environ.filters[
-            'gcb_tags'] = jinja_utils.get_gcb_tags_filter(self)
+    def _get_template_environ(self, additional_dirs):
+        """Returns a cached, fully configured Jinja environment."""
+        app_context = self.app_context
+        locale = app_context.get_current_locale()
+        key = (
+            app_context.get_namespace_name(), app_context.get_slug(), locale,
+            tuple(additional_dirs or ()),
+            jinja_utils.CAN_USE_JINJA2_TEMPLATE_CACHE.value)
+        template_environ = self._get_shared_template_environ(
+            key, locale, additional_dirs)
+        if not self._get_is_read_write_course():
+            return template_environ
+
+        # Templates of a read-write course may be edited at any time and the
+        # virtual file system loader can't tell if they are stale, so they are
+        # only cached for the duration of this request.
+        request_environ = self._request_template_environs.get(key)
+        if request_environ is None:
+            request_environ = template_environ.overlay(
+                cache_size=REQUEST_TEMPLATE_CACHE_SIZE)
+            self._request_template_environs[key] = request_environ
+        return request_environ
+
+    def _get_shared_template_environ(self, key, locale, additional_dirs):
+        """Returns the Jinja environment shared by all requests to a course."""
+        app_context = self.app_context
+        environs = ProcessScopedTemplateEnvironCache.instance().environs
+        cached_app_context, template_environ = environs.get(key, (None, None))
+        if cached_app_context is app_context:
+            i18n.get_i18n().set_locale(locale)
+            return template_environ
+
+        template_environ = app_context.get_template_environ(
+            locale, additional_dirs)
+        # Only the per-request overlays cache templates of read-write courses.
+        if app_context.fs.is_read_write():
+            template_environ.cache = None
+        template_environ.filters['gcb_tags'] = _gcb_tags
         template_environ.globals.update({
             'display_unit_title': (
                 lambda unit: resources_display.display_unit_title(
-                    unit, self.app_context)),
+                    unit, app_context)),
             'display_short_unit_title': (
                 lambda unit: resources_display.display_short_unit_title(
-                    unit, self.app_context)),
+                    unit, app_context)),
             'display_lesson_title': (
                 lambda unit, lesson: resources_display.display_lesson_title(
-                    unit, lesson, self.app_context))})
+                    unit, lesson, app_context))})
+        environs[key] = (app_context, template_environ)
+        return template_environ
 
-        return template_environ.get_template(template_file)
+    def get_template(self, template_file, additional_dirs=None, prefs=None):
+        """Computes location of template files for the current namespace."""
+
+        _p = self._environ()
+        self.init_template_values(_p, prefs=prefs)
+        template_environ = self._get_template_environ(additional_dirs)
+        return _HandlerTemplate(
+            template_environ.get_template(template_file), self)
 
 
 class BaseHandler(CourseHandler):
@@ -938,11 +1120,21 @@ class BaseHandler(CourseHandler):
 
     def personalize_page_and_get_user(self):
         """If the user exists, add personalized fields to the navbar."""
+        user, _ = self._personalize_page_and_get_user_and_student()
+        return user
+
+    def _personalize_page_and_get_user_and_student(self):
+        """Personalizes the page; returns the user and enrolled student.
+
+        Either value is None if there is no user or the user is not enrolled.
+        Callers that need both use this to avoid a second student lookup.
+        """
         user = self.get_user()
+        student = None
         PageInitializerService.get().initialize(self.template_value)
 
         if hasattr(self, 'app_context'):
-            self.template_value['can_register'] = self.app_context.get_environ(
+            self.template_value['can_register'] = self._environ(
                 )['reg_form']['can_register']
 
         if user:
@@ -951,45 +1143,41 @@ class BaseHandler(CourseHandler):
                 student.update_last_seen_on()
 
             email = user.email()
-            self.template_value['email_no_domain_name'] = (
-                email[:email.find('@')] if '@' in email else email)
-            self.template_value['email'] = email
-            self.template_value['logoutUrl'] = (
-                users.create_logout_url(self.request.uri))
-            self.template_value['transient_student'] = False
-
-            # configure page events
-            self.template_value['record_tag_events'] = (
-                CAN_PERSIST_TAG_EVENTS.value)
-            self.template_value['record_page_events'] = (
-                CAN_PERSIST_PAGE_EVENTS.value)
-            self.template_value['record_events'] = (
-                CAN_PERSIST_ACTIVITY_EVENTS.value)
-            self.template_value['event_xsrf_token'] = (
-                XsrfTokenManager.create_xsrf_token('event-post'))
+            self.template_value.update({
+                'email_no_domain_name': (
+                    email[:email.find('@')] if '@' in email else email),
+                'email': email,
+                'logoutUrl': users.create_logout_url(self.request.uri),
+                'transient_student': False,
+
+                # configure page events
+                'record_tag_events': CAN_PERSIST_TAG_EVENTS.value,
+                'record_page_events': CAN_PERSIST_PAGE_EVENTS.value,
+                'record_events': CAN_PERSIST_ACTIVITY_EVENTS.value,
+                'event_xsrf_token': LazyXsrfToken('event-post'),
+                })
         else:
-            self.template_value['loginUrl'] = users.create_login_url(
-                self.request.uri)
-            self.template_value['transient_student'] = True
-            return None
+            self.template_value.update({
+                'loginUrl': users.create_login_url(self.request.uri),
+                'transient_student': True,
+                })
+            return None, None
 
-        return user
+        return user, student
 
     def personalize_page_and_get_enrolled(
         self, supports_transient_student=False):
         """If the user is enrolled, add personalized fields to the navbar."""
-        user = self.personalize_page_and_get_user()
+        user, student = self._personalize_page_and_get_user_and_student()
         if user is None:
             student = TRANSIENT_STUDENT
-        else:
-            student = Student.get_enrolled_student_by_user(user)
-            if not student:
-                self.template_value['transient_student'] = True
-                student = TRANSIENT_STUDENT
+        elif not student:
+            self.template_value['transient_student'] = True
+            student = TRANSIENT_STUDENT
 
-        if student.is_transient:
+        if student is TRANSIENT_STUDENT or student.is_transient:
             if supports_transient_student and (
-                    self.app_context.get_environ()['course']['browsable']):
+                    self._environ()['course']['browsable']):
                 return TRANSIENT_STUDENT
             elif user is None:
                 self.redirect(
@@ -1082,29 +1270,25 @@ class PreviewHandler(BaseHandler):
 
     def get(self):
         """Handles GET requests."""
-        user = self.personalize_page_and_get_user()
-        if user is None:
+        user, student = self._personalize_page_and_get_user_and_student()
+        if not student:
             student = TRANSIENT_STUDENT
-        else:
-            student = Student.get_enrolled_student_by_user(user)
-            if not student:
-                student = TRANSIENT_STUDENT
 
         # If the course is browsable, or the student is logged in and
         # registered, redirect to the main course page.
-        if ((student and not student.is_transient) or
-            self.app_context.get_environ()['course']['browsable']):
+        if ((student is not TRANSIENT_STUDENT and not student.is_transient) or
+            self._environ()['course']['browsable']):
             self.redirect('/course')
             return
 
         self.template_value['transient_student'] = True
-        self.template_value['can_register'] = self.app_context.get_environ(
+        self.template_value['can_register'] = self._environ(
             )['reg_form']['can_register']
         self.template_value['navbar'] = {'course': True}
         self.template_value['units'] = self.get_units()
         self.template_value['show_registration_page'] = True
 
-        course = self.app_context.get_environ()['course']
+        course = self._environ()['course']
         self.template_value['video_exists'] = bool(
             'main_video' in course and
             'url' in course['main_video'] and
@@ -1116,12 +1300,12 @@ class PreviewHandler(BaseHandler):
 
         if user:
             profile = StudentProfileDAO.get_profile_by_user_id(user.user_id())
-            additional_registration_fields = self.app_context.get_environ(
+            additional_registration_fields = self._environ(
                 )['reg_form']['additional_registration_fields']
             if profile is not None and not additional_registration_fields:
                 self.template_value['show_registration_page'] = False
                 self.template_value['register_xsrf_token'] = (
-                    XsrfTokenManager.create_xsrf_token('register-post'))
+                    LazyXsrfToken('register-post'))
         self.render('preview.html')
 
 
@@ -1137,19 +1321,17 @@ class RegisterHandler(BaseHandler):
 
     def get(self):
         """Handles GET request."""
-        user = self.personalize_page_and_get_user()
+        user, student = self._personalize_page_and_get_user_and_student()
         if not user:
             self.redirect(
                 users.create_login_url(self.request.uri), normalize=False)
             return
 
-        student = Student.get_enrolled_student_by_user(user)
         if student:
             self.redirect('/course')
             return
 
-        can_register = self.app_context.get_environ(
-            )['reg_form']['can_register']
+        can_register = self._environ()['reg_form']['can_register']
         if not can_register:
             self.redirect('/course#registration_closed')
             return
@@ -1163,7 +1345,7 @@ class RegisterHandler(BaseHandler):
         self.template_value['navbar'] = {}
         self.template_value['transient_student'] = True
         self.template_value['register_xsrf_token'] = (
-            XsrfTokenManager.create_xsrf_token('register-post'))
+            LazyXsrfToken('register-post'))
 
         alternate_content = []
         for hook in self.PREVENT_REGISTRATION_HOOKS:
@@ -1183,13 +1365,12 @@ class RegisterHandler(BaseHandler):
         if not self.assert_xsrf_token_or_fail(self.request, 'register-post'):
             return
 
-        can_register = self.app_context.get_environ(
-            )['reg_form']['can_register']
+        can_register = self._environ()['reg_form']['can_register']
         if not can_register:
             self.redirect('/course#registration_closed')
             return
 
-        if 'name_from_profile' in self.request.POST.keys():
+        if 'name_from_profile' in self.request.POST:
             profile = StudentProfileDAO.get_profile_by_user_id(user.user_id())
             name = profile.nick_name
         else:
@@ -1239,17 +1420,20 @@ class StudentProfileHandler(BaseHandler):
 
         track_labels = models.LabelDAO.get_all_of_type(
             models.LabelDTO.LABEL_TYPE_COURSE_TRACK)
+        track_label_ids = frozenset(label.id for label in track_labels)
 
         course = self.get_course()
+        child_unit_ids = course.get_child_unit_ids()
         units = []
         for unit in course.get_units():
             # Don't show assessments that are part of units.
-            if course.get_parent_unit(unit.unit_id):
+            if str(unit.unit_id) in child_unit_ids:
                 continue
             units.append({
                 'unit_id': unit.unit_id,
                 'title': unit.title,
-                'labels': list(course.get_unit_track_labels(unit)),
+                'labels': list(course.get_unit_track_labels(
+                    unit, all_track_ids=track_label_ids)),
                 })
 
         name = student.name
@@ -1258,23 +1442,24 @@ class StudentProfileHandler(BaseHandler):
             name = profile.nick_name
         student_labels = student.get_labels_of_type(
             models.LabelDTO.LABEL_TYPE_COURSE_TRACK)
-        self.template_value['navbar'] = {'progress': True}
-        self.template_value['student'] = student
-        self.template_value['student_name'] = name
-        self.template_value['date_enrolled'] = student.enrolled_on.strftime(
-            HUMAN_READABLE_DATE_FORMAT)
-        self.template_value['score_list'] = course.get_all_scores(student)
-        self.template_value['overall_score'] = course.get_overall_score(student)
-        self.template_value['student_edit_xsrf_token'] = (
-            XsrfTokenManager.create_xsrf_token('student-edit'))
-        self.template_value['can_edit_name'] = (
-            not models.CAN_SHARE_STUDENT_PROFILE.value)
-        self.template_value['track_labels'] = track_labels
-        self.template_value['student_labels'] = student_labels
-        self.template_value['units'] = units
-        self.template_value['track_env'] = transforms.dumps({
-            'label_ids': [label.id for label in track_labels],
-            'units': units
+        score_list, overall_score = course.get_scores_and_overall(student)
+        self.template_value.update({
+            'navbar': {'progress': True},
+            'student': student,
+            'student_name': name,
+            'date_enrolled': student.enrolled_on.strftime(
+                HUMAN_READABLE_DATE_FORMAT),
+            'score_list': score_list,
+            'overall_score': overall_score,
+            'student_edit_xsrf_token': LazyXsrfToken('student-edit'),
+            'can_edit_name': not models.CAN_SHARE_STUDENT_PROFILE.value,
+            'track_labels': track_labels,
+            'student_labels': student_labels,
+            'units': units,
+            'track_env': transforms.dumps({
+                'label_ids': [label.id for label in track_labels],
+                'units': units
+                }),
             })
 
         # Append any extra data which is provided by modules
@@ -1322,21 +1507,19 @@ class StudentSetTracksHandler(BaseHandler):
 
         all_track_label_ids = models.LabelDAO.get_set_of_ids_of_type(
             models.LabelDTO.LABEL_TYPE_COURSE_TRACK)
-        new_track_label_ids = set(
-            [int(label_id)
-             for label_id in self.request.get_all('labels')
-             if label_id and int(label_id) in all_track_label_ids])
+        new_track_label_ids = all_track_label_ids.intersection(
+            int(label_id) for label_id in self.request.get_all('labels')
+            if label_id)
         student_label_ids = set(
-            [int(label_id)
-             for label_id in common_utils.text_to_list(student.labels)
-             if label_id])
+            int(label_id)
+            for label_id in common_utils.text_to_list(student.labels))
 
         # Remove all existing track (and only track) labels from student,
         # then merge in selected set from form.
-        student_label_ids = student_label_ids.difference(all_track_label_ids)
-        student_label_ids = student_label_ids.union(new_track_label_ids)
+        student_label_ids.difference_update(all_track_label_ids)
+        student_label_ids.update(new_track_label_ids)
         models.Student.set_labels_for_current(
-            common_utils.list_to_text(list(student_label_ids)))
+            common_utils.list_to_text(student_label_ids))
 
         self.redirect('/student/home')
 
@@ -1398,7 +1581,7 @@ class StudentUnenrollHandler(BaseHandler):
         self.template_value['student'] = student
         self.template_value['navbar'] = {}
         self.template_value['student_unenroll_xsrf_token'] = (
-            XsrfTokenManager.create_xsrf_token('student-unenroll'))
+            LazyXsrfToken('student-unenroll'))
         hook_items = []
         for hook in self.GET_HOOKS:
             hook_items.extend(hook(self.app_context))
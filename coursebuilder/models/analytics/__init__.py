@@ -135,7 +135,7 @@ class _TemplateRenderer(object):
             template_dirs.extend(self._handler.ADDITIONAL_DIRS)
         return jinja2.utils.Markup(
             self._handler.get_template(template_name, template_dirs).render(
-                template_values, autoescape=True))
+                template_values))
 
     def get_base_href(self):
         return controllers_utils.ApplicationHandler.get_base_href(self._handler)
@@ -671,6 +671,9 @@ class CourseModel12(object):
     def get_parent_unit(self, unused_unit_id):
         return None  # This model does not support any kind of unit relations
 
+    def get_child_unit_ids(self):
+        return set()  # This model does not support any kind of unit relations
+
     def get_review_filename(self, unit_id):
         """Returns the review filename from unit id."""
         return 'assets/js/review-%s.js' % unit_id
@@ -1332,6 +1335,16 @@ class CourseModel13(object):
         # Nope, no other kinds of parentage; no parent.
         return None
 
+    def get_child_unit_ids(self):
+        """Returns IDs (as strings) of all units that have a parent unit."""
+        child_unit_ids = set()
+        for unit in self._units:
+            if unit.pre_assessment is not None:
+                child_unit_ids.add(str(unit.pre_assessment))
+            if unit.post_assessment is not None:
+                child_unit_ids.add(str(unit.post_assessment))
+        return child_unit_ids
+
     def add_unit(self, unit_type, title, custom_unit_type=None):
         """Adds a brand new unit."""
         assert unit_type in verify.UNIT_TYPES
@@ -2747,12 +2760,21 @@ class Course(object):
         return models.LabelDAO.apply_course_track_labels_to_student_labels(
             self, student, self.get_units())
 
-    def get_unit_track_labels(self, unit):
-        all_track_ids = models.LabelDAO.get_set_of_ids_of_type(
-            models.LabelDTO.LABEL_TYPE_COURSE_TRACK)
-        return set([int(label_id) for label_id in
-                    common_utils.text_to_list(unit.labels)
-                    if int(label_id) in all_track_ids])
+    def get_unit_track_labels(self, unit, all_track_ids=None):
+        """Gets IDs of course track labels on a unit.
+
+        Args:
+          unit: the unit to inspect
+          all_track_ids: IDs of all course track labels; pass these in when
+              calling for many units so labels are not reloaded for each one
+        Returns:
+          a set of integer label IDs
+        """
+        if all_track_ids is None:
+            all_track_ids = models.LabelDAO.get_set_of_ids_of_type(
+                models.LabelDTO.LABEL_TYPE_COURSE_TRACK)
+        label_ids = set(map(int, common_utils.text_to_list(unit.labels)))
+        return label_ids.intersection(all_track_ids)
 
     def get_lessons(self, unit_id):
         return self._model.get_lessons(unit_id)
@@ -2844,7 +2866,23 @@ class Course(object):
 
     def get_overall_score(self, student):
         """Gets the overall course score for a student."""
+        return self._get_overall_score(self.get_all_scores(student))
+
+    def get_scores_and_overall(self, student):
+        """Gets all score data and the overall score in a single pass.
+
+        Args:
+            student: the student whose scores should be retrieved.
+
+        Returns:
+            A pair of the list returned by get_all_scores() and the value
+            returned by get_overall_score().
+        """
         score_list = self.get_all_scores(student)
+        return score_list, self._get_overall_score(score_list)
+
+    @classmethod
+    def _get_overall_score(cls, score_list):
         overall_score = 0
         total_weight = 0
         for unit in score_list:
@@ -2982,6 +3020,9 @@ class Course(object):
     def get_parent_unit(self, unit_id):
         return self._model.get_parent_unit(unit_id)
 
+    def get_child_unit_ids(self):
+        return self._model.get_child_unit_ids()
+
     def get_components(self, unit_id, lesson_id, use_lxml=True):
         """Returns a list of dicts representing the components in a lesson.
 
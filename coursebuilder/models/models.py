@@ -65,6 +65,9 @@ MEMCACHE_MULTI_MAX = 32 * 1000 * 1000
 # Update frequency for Student.last_seen_on.
 STUDENT_LAST_SEEN_ON_UPDATE_SEC = 24 * 60 * 60  # 1 day.
 
+# How long concurrent requests are kept from repeating a last_seen_on write.
+STUDENT_LAST_SEEN_ON_LOCK_SEC = 60 * 60  # 1 hour.
+
 # Global memcache controls.
 CAN_USE_MEMCACHE = config.ConfigProperty(
     'gcb_can_use_memcache', bool, (
@@ -332,6 +335,28 @@ class MemcacheManager(object):
                 mapping, cls._get_namespace(namespace))
             return None
 
+    @classmethod
+    def add(cls, key, value, ttl=DEFAULT_CACHE_TTL_SECS, namespace=None):
+        """Adds an item to memcache unless it is already there.
+
+        Returns:
+          False only if the key is present in memcache. True if the item was
+          added, and also when memcache is disabled or failed to add the item
+          for any other reason, so callers using this as a lock fail open.
+        """
+        _namespace = cls._get_namespace(namespace)
+        try:
+            if CAN_USE_MEMCACHE.value:
+                CACHE_PUT.inc()
+                if memcache.add(key, value, ttl, namespace=_namespace):
+                    return True
+                # memcache.add() also returns False on service errors; only
+                # report the key as taken if it can actually be read back.
+                return memcache.get(key, namespace=_namespace) is None
+        except:  # pylint: disable=bare-except
+            logging.exception('Failed to add: %s, %s', key, _namespace)
+        return True
+
     @classmethod
     def delete(cls, key, namespace=None):
         """Deletes an item from memcache if memcache is enabled."""
@@ -1584,7 +1609,12 @@ class Student(BaseEntity):
         now = now if now is not None else datetime.datetime.utcnow()
         value = value if value is not None else now
 
-        if self._should_update_last_seen_on(value):
+        # Only the first of several concurrent requests does the write; the
+        # rest would otherwise all see the same stale value and put() again.
+        if (self._should_update_last_seen_on(value) and
+            MemcacheManager.add(
+                'student-last-seen-on:%s' % self.user_id, True,
+                ttl=STUDENT_LAST_SEEN_ON_LOCK_SEC)):
             self.last_seen_on = value
             self.put()
             StudentCache.remove(self.user_id)
@@ -23,6 +23,7 @@ import models
 import courses
 import messages
 
+from common import caching
 from common import resource
 from common import safe_dom
 from common import schema_fields
@@ -1078,56 +1079,124 @@ class ResourceLesson(resource.AbstractResourceHandler):
         return 'dashboard?action=edit_lesson&key=%s' % key
 
 
+class TitleFormatsCache(caching.RequestScopedSingleton):
+    """Holds unit title settings and translations for the current request.
+
+    Titles are rendered many times per page; this avoids a deep copy of the
+    course settings and a translation lookup for each of them.  The cache is
+    cleared with every other request-scoped object, which also happens when
+    the locale or the course settings change.
+    """
+
+    def __init__(self):
+        self._items = {}
+
+    @classmethod
+    def get(cls, app_context, name, factory):
+        key = (app_context.get_namespace_name(),
+               app_context.get_current_locale(), name)
+        items = cls.instance()._items
+        if key not in items:
+            items[key] = factory(app_context)
+        return items[key]
+
+
+def _load_unit_title_without_index(app_context):
+    return bool(app_context.get_environ()['course'].get(
+        'display_unit_title_without_index'))
+
+
+def _translate_unit_title(app_context):
+    # I18N: Message displayed as title for unit within a course.
+    # Note that the items %(index) and %(title).  The %(index)
+    # will be replaced with a number indicating the unit's
+    # sequence I18N: number within the course, and the %(title)
+    # with the unit's title.
+    return app_context.gettext('Unit %(index)s - %(title)s')
+
+
+def _translate_short_unit_title(app_context):
+    # I18N: Message displayed as title for unit within a course.  The
+    # "%s" will be replaced with the index number of the unit within
+    # the course.  E.g., "Unit 1", "Unit 2" and so on.
+    return app_context.gettext('Unit %s')
+
+
+def _is_unit_title_without_index(app_context):
+    return TitleFormatsCache.get(
+        app_context, 'without_index', _load_unit_title_without_index)
+
+
 def get_unit_title_template(app_context):
     """Prepare an internationalized display for the unit title."""
-    course_properties = app_context.get_environ()
-    if course_properties['course'].get('display_unit_title_without_index'):
+    if _is_unit_title_without_index(app_context):
         return '%(title)s'
-    else:
-        # I18N: Message displayed as title for unit within a course.
-        # Note that the items %(index) and %(title).  The %(index)
-        # will be replaced with a number indicating the unit's
-        # sequence I18N: number within the course, and the %(title)
-        # with the unit's title.
-        return app_context.gettext('Unit %(index)s - %(title)s')
+    return TitleFormatsCache.get(
+        app_context, 'unit_title', _translate_unit_title)
+
+
+def _create_title_formatters(app_context):
+    """Creates unit and lesson title functions for the course's settings.
+
+    The choice between indexed and unindexed titles is made here once per
+    request rather than on every title rendered.
+
+    Returns:
+      A tuple of functions formatting the unit title, the short unit title
+      and the lesson title prefix.
+    """
+    if _is_unit_title_without_index(app_context):
+        def format_unit_title(unit):
+            return unit.title
+
+        def format_lesson_prefix(unused_unit, lesson):
+            return str(lesson.index) + ' '
+
+        return format_unit_title, format_unit_title, format_lesson_prefix
+
+    unit_title = TitleFormatsCache.get(
+        app_context, 'unit_title', _translate_unit_title)
+    short_unit_title = TitleFormatsCache.get(
+        app_context, 'short_unit_title', _translate_short_unit_title)
+
+    def format_unit_title(unit):
+        return unit_title % {'index': unit.index, 'title': unit.title}
+
+    def format_short_unit_title(unit):
+        if unit.type != 'U':
+            return unit.title
+        return short_unit_title % unit.index
+
+    def format_lesson_prefix(unit, lesson):
+        return str(unit.index) + '.' + str(lesson.index) + ' '
+
+    return format_unit_title, format_short_unit_title, format_lesson_prefix
+
+
+def _get_title_formatters(app_context):
+    return TitleFormatsCache.get(
+        app_context, 'title_formatters', _create_title_formatters)
 
 
 def display_unit_title(unit, app_context):
     """Prepare an internationalized display for the unit title."""
-    course_properties = app_context.get_environ()
-    template = get_unit_title_template(app_context)
-    return template % {'index': unit.index, 'title': unit.title}
+    return _get_title_formatters(app_context)[0](unit)
 
 
 def display_short_unit_title(unit, app_context):
     """Prepare a short unit title."""
-    course_properties = app_context.get_environ()
-    if course_properties['course'].get('display_unit_title_without_index'):
-        return unit.title
-    if unit.type != 'U':
-        return unit.title
-    # I18N: Message displayed as title for unit within a course.  The
-    # "%s" will be replaced with the index number of the unit within
-    # the course.  E.g., "Unit 1", "Unit 2" and so on.
-    unit_title = app_context.gettext('Unit %s')
-    return unit_title % unit.index
+    return _get_title_formatters(app_context)[1](unit)
 
 
 def display_lesson_title(unit, lesson, app_context):
     """Prepare an internationalized display for the unit title."""
 
-    course_properties = app_context.get_environ()
     content = safe_dom.NodeList()
     span = safe_dom.Element('span')
     content.append(span)
 
     if lesson.auto_index:
-        prefix = ''
-        if course_properties['course'].get('display_unit_title_without_index'):
-            prefix = '%s ' % lesson.index
-        else:
-            prefix = '%s.%s ' % (unit.index, lesson.index)
-        span.add_text(prefix)
+        span.add_text(_get_title_formatters(app_context)[2](unit, lesson))
         _class = ''
     else:
         _class = 'no-index'
@@ -338,7 +338,7 @@ class BaseAdminHandler(ConfigPropertyEditor):
                 href=href, target=target)
 
             if handler:
-                cls.get_actions.append(key)
+                cls.add_action('get', key)
                 cls.actions_to_menu_items[key] = menu_item
 
         bind('courses', 'Courses', cls.get_courses)
@@ -374,16 +374,16 @@ class BaseAdminHandler(ConfigPropertyEditor):
 
     @classmethod
     def bind_get_actions(cls):
-        cls.get_actions.append('add_course')
-        cls.get_actions.append('config_edit')
+        cls.add_action('get', 'add_course')
+        cls.add_action('get', 'config_edit')
 
     @classmethod
     def bind_post_actions(cls):
-        cls.post_actions.append('config_override')
-        cls.post_actions.append('config_reset')
+        cls.add_action('post', 'config_override')
+        cls.add_action('post', 'config_reset')
 
         if DIRECT_CODE_EXECUTION_UI_ENABLED:
-            cls.post_actions.append('console_run')
+            cls.add_action('post', 'console_run')
 
     def can_view(self, action):
         """Checks if current user has viewing rights."""
@@ -946,8 +946,8 @@ Input your Python code below and press "Run Program" to execute.""")
 
     @classmethod
     def disable(cls):
-        cls.post_actions = []
-        cls.get_actions = []
+        cls.set_actions('post', [])
+        cls.set_actions('get', [])
 
     def default_action_for_current_permissions(self):
         """Set the default or first active navigation tab as default action."""
@@ -1120,7 +1120,7 @@ class DashboardExtension(object):
 
         def post_action(handler):
             cls(handler).post_data_pump()
-        dashboard.DashboardHandler.post_actions.append(DASHBOARD_ACTION)
+        dashboard.DashboardHandler.add_action('post', DASHBOARD_ACTION)
         setattr(dashboard.DashboardHandler, 'post_%s' % DASHBOARD_ACTION,
                 post_action)
         dashboard.DashboardHandler.map_action_to_permission(
@@ -1128,7 +1128,7 @@ class DashboardExtension(object):
 
     @classmethod
     def unregister(cls):
-        dashboard.DashboardHandler.post_actions.remove(DASHBOARD_ACTION)
+        dashboard.DashboardHandler.remove_action('post', DASHBOARD_ACTION)
         setattr(dashboard.DashboardHandler, 'post_%s' % DASHBOARD_ACTION, None)
         dashboard.DashboardHandler.unmap_action_to_permission(
             'post_%s' % DASHBOARD_ACTION, ACCESS_PERMISSION)
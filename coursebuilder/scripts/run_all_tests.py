@@ -71,8 +71,8 @@ ALL_TEST_CLASSES = {
     'tests.functional.admin_settings.JinjaContextTest': 2,
     'tests.functional.admin_settings.WelcomePageTests': 6,
     'tests.functional.assets_rest.AssetsRestTest': 13,
-    'tests.functional.common_crypto.EncryptionManagerTests': 5,
-    'tests.functional.common_crypto.XsrfTokenManagerTests': 3,
+    'tests.functional.common_crypto.EncryptionManagerTests': 6,
+    'tests.functional.common_crypto.XsrfTokenManagerTests': 4,
     'tests.functional.common_crypto.PiiObfuscationHmac': 2,
     'tests.functional.common_crypto.GenCryptoKeyFromHmac': 2,
     'tests.functional.common_crypto.GetExternalUserIdTests': 4,
@@ -85,6 +85,9 @@ ALL_TEST_CLASSES = {
     'tests.functional.controllers_review.PeerReviewControllerTest': 7,
     'tests.functional.controllers_review.PeerReviewDashboardAdminTest': 1,
     'tests.functional.controllers_review.PeerReviewDashboardStudentTest': 2,
+    'tests.functional.controllers_utils.LazyXsrfTokenTests': 3,
+    'tests.functional.controllers_utils.ReflectiveRequestHandlerTests': 8,
+    'tests.functional.controllers_utils.TemplateEnvironCacheTests': 7,
     'tests.functional.i18n.I18NCourseSettingsTests': 7,
     'tests.functional.i18n.I18NMultipleChoiceQuestionTests': 6,
     'tests.functional.model_analytics.AnalyticsTabsWithNoJobs': 8,
@@ -94,6 +97,7 @@ ALL_TEST_CLASSES = {
     'tests.functional.model_analytics.QuestionAnalyticsTest': 3,
     'tests.functional.model_config.ValueLoadingTests': 2,
     'tests.functional.model_courses.CourseCachingTest': 5,
+    'tests.functional.model_courses.CourseUnitRelationsTest': 1,
     'tests.functional.model_data_sources.PaginatedTableTest': 17,
     'tests.functional.model_data_sources.PiiExportTest': 4,
     'tests.functional.model_entities.BaseEntityTestCase': 3,
@@ -103,14 +107,14 @@ ALL_TEST_CLASSES = {
     'tests.functional.model_models.BaseJsonDaoTestCase': 1,
     'tests.functional.model_models.ContentChunkTestCase': 15,
     'tests.functional.model_models.EventEntityTestCase': 1,
-    'tests.functional.model_models.MemcacheManagerTestCase': 4,
+    'tests.functional.model_models.MemcacheManagerTestCase': 7,
     'tests.functional.model_models.PersonalProfileTestCase': 1,
     'tests.functional.model_models.QuestionDAOTestCase': 3,
     'tests.functional.model_models.StudentAnswersEntityTestCase': 1,
     'tests.functional.model_models.StudentLifecycleObserverTestCase': 13,
     'tests.functional.model_models.StudentProfileDAOTestCase': 6,
     'tests.functional.model_models.StudentPropertyEntityTestCase': 1,
-    'tests.functional.model_models.StudentTestCase': 11,
+    'tests.functional.model_models.StudentTestCase': 13,
     'tests.functional.model_student_work.KeyPropertyTest': 4,
     'tests.functional.model_student_work.ReviewTest': 3,
     'tests.functional.model_student_work.SubmissionTest': 3,
@@ -329,7 +333,7 @@ ALL_TEST_CLASSES = {
     'tests.unit.modules_search.ParserTests': 10,
     'tests.unit.test_classes.DeepDictionaryMergeTest': 5,
     'tests.unit.test_classes.EtlRetryTest': 3,
-    'tests.unit.test_classes.InvokeExistingUnitTest': 5,
+    'tests.unit.test_classes.InvokeExistingUnitTest': 7,
     'tests.unit.test_classes.ReviewModuleDomainTests': 1,
     'tests.unit.test_classes.SuiteTestCaseTest': 3,
     'tests.unit.gift_parser_tests.SampleQuestionsTest': 1,
@@ -17,6 +17,7 @@
 
 __author__ = 'Mike Gainer (mgainer@google.com)'
 
+import hmac
 import re
 
 import actions
@@ -35,6 +36,14 @@ class EncryptionManagerTests(actions.TestBase):
         self.assertEquals(h1, h2)
         self.assertNotEquals(h1, message)
 
+    def test_hmac_matches_fresh_digester(self):
+        message = 'Mary had a little lamb.  Her doctors were astounded'
+        crypto.EncryptionManager.hmac([message])  # Warm up cached digester.
+        expected = hmac.new(
+            str(crypto.EncryptionManager._get_hmac_secret()), message).digest()
+        self.assertEquals(
+            expected, crypto.EncryptionManager.hmac(['Mary had ', message[9:]]))
+
     def test_encrypt_is_consistent(self):
         message = 'Mary had a little lamb.  Her doctors were astounded'
         e1 = crypto.EncryptionManager.encrypt(message)
@@ -121,6 +130,13 @@ class XsrfTokenManagerTests(actions.TestBase):
         self.assertFalse(crypto.XsrfTokenManager.is_xsrf_token_valid(
             t, action + '.'))
 
+    def test_empty_or_malformed_token(self):
+        action = 'lob_cheese'
+        t = crypto.XsrfTokenManager.create_xsrf_token(action)
+        for token in [None, '', t.replace('/', ''), 'x' + t, '/' + t]:
+            self.assertFalse(crypto.XsrfTokenManager.is_xsrf_token_valid(
+                token, action))
+
 
 class PiiObfuscationHmac(actions.TestBase):
 
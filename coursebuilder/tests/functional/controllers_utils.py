@@ -0,0 +1,264 @@
+# Copyright 2015 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS-IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the handler base classes in controllers/utils.py."""
+
+import actions
+import webapp2
+
+from common import crypto
+from controllers import sites
+from controllers import utils
+from models import vfs
+
+
+class _FakeRequest(object):
+
+    def __init__(self, params):
+        self._params = params
+
+    def get(self, name):
+        return self._params.get(name, '')
+
+
+def _make_reflective_handler_class():
+    """Creates a handler class with its own, freshly built action lists."""
+
+    class _Handler(utils.ReflectiveRequestHandler):
+
+        default_action = 'list'
+        get_actions = ['list']
+        post_actions = []
+
+        def __init__(self, **params):
+            self.request = _FakeRequest(params)
+            self.status = None
+
+        def error(self, status):
+            self.status = status
+
+        def get_list(self):
+            return 'list'
+
+        def get_edit(self):
+            return 'edit'
+
+    return _Handler
+
+
+class ReflectiveRequestHandlerTests(actions.TestBase):
+
+    def setUp(self):
+        super(ReflectiveRequestHandlerTests, self).setUp()
+        self.handler_class = _make_reflective_handler_class()
+
+    def _get(self, action, handler_class=None):
+        handler = (handler_class or self.handler_class)(action=action)
+        return handler.get(), handler.status
+
+    def test_default_action(self):
+        self.assertEquals(('list', None), self._get(''))
+
+    def test_action_appended(self):
+        self.assertEquals((None, 404), self._get('edit'))
+        self.handler_class.add_action('get', 'edit')
+        self.assertEquals(('edit', None), self._get('edit'))
+
+    def test_action_removed(self):
+        self.handler_class.add_action('get', 'edit')
+        self.assertEquals(('edit', None), self._get('edit'))
+        self.handler_class.remove_action('get', 'edit')
+        self.assertEquals((None, 404), self._get('edit'))
+
+    def test_action_list_replaced(self):
+        self.assertEquals(('list', None), self._get('list'))
+        self.handler_class.set_actions('get', ['edit'])
+        self.assertEquals((None, 404), self._get('list'))
+        self.assertEquals(('edit', None), self._get('edit'))
+
+    def test_action_swapped(self):
+        self.assertEquals(('list', None), self._get('list'))
+        self.handler_class.remove_action('get', 'list')
+        self.handler_class.add_action('get', 'edit')
+        self.assertEquals((None, 404), self._get('list'))
+        self.assertEquals(('edit', None), self._get('edit'))
+
+    def test_subclass_sees_actions_added_to_inherited_list(self):
+        subclass = type('_SubHandler', (self.handler_class,), {})
+        self.assertEquals((None, 404), self._get('edit', subclass))
+        self.handler_class.add_action('get', 'edit')
+        self.assertEquals(('edit', None), self._get('edit', subclass))
+
+    def test_method_bound_after_action_added(self):
+        # Same order as modules/data_pump: the action is listed first and
+        # its method is bound afterwards.
+        self.handler_class.add_action('get', 'pump')
+        self.assertEquals((None, 404), self._get('pump'))
+        setattr(self.handler_class, 'get_pump', lambda self: 'pump')
+        self.assertEquals(('pump', None), self._get('pump'))
+
+    def test_method_rebound(self):
+        self.assertEquals(('list', None), self._get('list'))
+        setattr(self.handler_class, 'get_list', lambda self: 'new list')
+        self.assertEquals(('new list', None), self._get('list'))
+
+
+class LazyXsrfTokenTests(actions.TestBase):
+
+    def setUp(self):
+        super(LazyXsrfTokenTests, self).setUp()
+        self.created_tokens = []
+        test = self
+
+        class CountingXsrfTokenManager(crypto.XsrfTokenManager):
+
+            @classmethod
+            def create_xsrf_token(cls, action):
+                token = super(
+                    CountingXsrfTokenManager, cls).create_xsrf_token(action)
+                test.created_tokens.append(token)
+                return token
+
+        self.swap(utils, 'XsrfTokenManager', CountingXsrfTokenManager)
+
+    def test_token_not_created_until_rendered(self):
+        token = utils.LazyXsrfToken('lazy-action')
+        self.assertEquals([], self.created_tokens)
+
+        unicode(token)
+        self.assertEquals(1, len(self.created_tokens))
+
+    def test_token_created_once(self):
+        token = utils.LazyXsrfToken('lazy-action')
+        first = unicode(token)
+
+        self.assertEquals(first, unicode(token))
+        self.assertEquals(first.encode('utf-8'), str(token))
+        self.assertEquals([first], self.created_tokens)
+
+    def test_token_is_valid_for_action(self):
+        token = str(utils.LazyXsrfToken('lazy-action'))
+        self.assertTrue(
+            crypto.XsrfTokenManager.is_xsrf_token_valid(token, 'lazy-action'))
+        self.assertFalse(
+            crypto.XsrfTokenManager.is_xsrf_token_valid(token, 'other-action'))
+
+
+class TemplateEnvironCacheTests(actions.TestBase):
+
+    def setUp(self):
+        super(TemplateEnvironCacheTests, self).setUp()
+
+        # Getting an environment sets the i18n locale of the current request.
+        self.app = webapp2.WSGIApplication()
+        request = webapp2.Request.blank('/')
+        request.app = self.app
+        self.app.set_globals(app=self.app, request=request)
+
+    def tearDown(self):
+        self.app.clear_globals()
+        super(TemplateEnvironCacheTests, self).tearDown()
+
+    def _create_app_context(self, read_write=False):
+        if read_write:
+            fs = vfs.DatastoreBackedFileSystem('ns_environ_cache', '/')
+        else:
+            fs = vfs.LocalReadOnlyFileSystem(logical_home_folder='/')
+        app_context = sites.ApplicationContext(
+            'course', '/environ_cache', '/', 'ns_environ_cache',
+            vfs.AbstractFileSystem(fs))
+        app_context.set_current_locale('en_US')
+        return app_context
+
+    def _create_handler(self, app_context):
+        handler = utils.CourseHandler()
+        handler.app_context = app_context
+        return handler
+
+    def _get_environ(self, app_context):
+        # pylint: disable=protected-access
+        return self._create_handler(app_context)._get_template_environ(None)
+
+    def test_same_app_context_and_locale_reuse_environ(self):
+        app_context = self._create_app_context()
+        self.assertIs(
+            self._get_environ(app_context), self._get_environ(app_context))
+
+    def test_new_app_context_gets_new_environ(self):
+        environ = self._get_environ(self._create_app_context())
+        self.assertIsNot(
+            environ, self._get_environ(self._create_app_context()))
+
+    def test_other_locale_gets_other_environ(self):
+        app_context = self._create_app_context()
+        environ = self._get_environ(app_context)
+
+        app_context.set_current_locale('fr')
+        self.assertIsNot(environ, self._get_environ(app_context))
+
+        app_context.set_current_locale('en_US')
+        self.assertIs(environ, self._get_environ(app_context))
+
+    def test_read_write_course_caches_templates_per_request(self):
+        # pylint: disable=protected-access
+        app_context = self._create_app_context(read_write=True)
+        handler = self._create_handler(app_context)
+        environ = handler._get_template_environ(None)
+        self.assertIsNotNone(environ.cache)
+        self.assertIs(environ, handler._get_template_environ(None))
+
+        other_environ = self._get_environ(app_context)
+        self.assertIsNot(environ, other_environ)
+        self.assertIsNot(environ.cache, other_environ.cache)
+        self.assertIs(environ.linked_to, other_environ.linked_to)
+        self.assertIsNone(environ.linked_to.cache)
+
+    def _create_template(self, handler, source='{{ text|gcb_tags }}'):
+        # pylint: disable=protected-access
+        return utils._HandlerTemplate(
+            self._get_environ(handler.app_context).from_string(source),
+            handler)
+
+    def test_template_binds_handler_only_while_rendering(self):
+        # pylint: disable=protected-access
+        handler = self._create_handler(self._create_app_context())
+        bound_handlers = []
+        template = self._create_template(
+            handler, '{{ bound() }}{{ text|gcb_tags }}')
+
+        self.assertIsNone(utils._get_template_handler())
+        self.assertEquals('text', template.render(
+            text='text',
+            bound=lambda: bound_handlers.append(utils._get_template_handler())))
+        self.assertEquals([handler], bound_handlers)
+        self.assertIsNone(utils._get_template_handler())
+
+    def test_nested_render_restores_enclosing_handler(self):
+        # pylint: disable=protected-access
+        app_context = self._create_app_context()
+        handler = self._create_handler(app_context)
+        nested_handler = self._create_handler(app_context)
+        utils._set_template_handler(handler)
+        try:
+            self.assertEquals(
+                'text',
+                self._create_template(nested_handler).render(text='text'))
+            self.assertIs(handler, utils._get_template_handler())
+        finally:
+            utils._set_template_handler(None)
+
+    def test_gcb_tags_without_handler_passes_text_through(self):
+        # pylint: disable=protected-access
+        utils._set_template_handler(None)
+        self.assertEquals('<b>text</b>', utils._gcb_tags('<b>text</b>'))
@@ -184,3 +184,33 @@ class CourseCachingTest(actions.TestBase):
             memcache_keys[0:1],
             memcache_values.keys(),
             'Only shard zero should be present in memcache.')
+
+
+class CourseUnitRelationsTest(actions.TestBase):
+
+    COURSE_NAME = 'test_course'
+    ADMIN_EMAIL = 'admin@foo.com'
+
+    def setUp(self):
+        super(CourseUnitRelationsTest, self).setUp()
+        self.app_context = actions.simple_add_course(
+            self.COURSE_NAME, self.ADMIN_EMAIL, 'Test Course')
+        self.course = courses.Course(handler=None, app_context=self.app_context)
+
+    def test_child_unit_ids_match_parent_lookup(self):
+        unit = self.course.add_unit()
+        pre_assessment = self.course.add_assessment()
+        post_assessment = self.course.add_assessment()
+        other_assessment = self.course.add_assessment()
+        unit.pre_assessment = pre_assessment.unit_id
+        unit.post_assessment = post_assessment.unit_id
+        self.course.save()
+
+        child_unit_ids = self.course.get_child_unit_ids()
+        self.assertEquals(
+            set([str(pre_assessment.unit_id), str(post_assessment.unit_id)]),
+            child_unit_ids)
+        for item in [unit, pre_assessment, post_assessment, other_assessment]:
+            self.assertEquals(
+                self.course.get_parent_unit(item.unit_id) is not None,
+                str(item.unit_id) in child_unit_ids)
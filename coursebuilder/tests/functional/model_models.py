@@ -342,6 +342,22 @@ class MemcacheManagerTestCase(actions.TestBase):
         data = models.MemcacheManager.get_multi(['a', 'b', 'c'])
         self.assertEquals(0, len(data.keys()))
 
+    def test_add(self):
+        self.assertTrue(models.MemcacheManager.add('a', 'A'))
+        self.assertFalse(models.MemcacheManager.add('a', 'B'))
+        self.assertEquals('A', models.MemcacheManager.get('a'))
+
+    def test_add_no_memcache(self):
+        config.Registry.test_overrides = {}
+        self.assertTrue(models.MemcacheManager.add('a', 'A'))
+        self.assertTrue(models.MemcacheManager.add('a', 'B'))
+
+    def test_add_fails_open_when_memcache_errs(self):
+        # memcache.add() returns False on service errors, not just when the
+        # key is present.
+        self.swap(models.memcache, 'add', lambda *args, **kwargs: False)
+        self.assertTrue(models.MemcacheManager.add('a', 'A'))
+
 
 class TestEntity(entities.BaseEntity):
     data = db.TextProperty(indexed=False)
@@ -640,6 +656,38 @@ class StudentTestCase(actions.ExportTestBase):
 
         self.assertEquals(old_enough, student.last_seen_on)
 
+    def test_update_last_seen_on_takes_lock_and_writes_once(self):
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            now = datetime.datetime.utcnow()
+            student = models.Student(last_seen_on=None, user_id='1')
+            key = student.put()
+            stale_student = db.get(key)
+
+            student.update_last_seen_on(now=now, value=now)
+
+            self.assertEquals(now, db.get(key).last_seen_on)
+            self.assertTrue(
+                models.MemcacheManager.get('student-last-seen-on:1'))
+
+            # A concurrent request still holding the old entity must not
+            # write again while the lock is held.
+            later = now + datetime.timedelta(seconds=1)
+            stale_student.update_last_seen_on(now=later, value=later)
+
+            self.assertEquals(now, db.get(key).last_seen_on)
+
+    def test_update_last_seen_on_skipped_while_another_update_in_flight(self):
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            now = datetime.datetime.utcnow()
+            student = models.Student(last_seen_on=None, user_id='1')
+            key = student.put()
+            models.MemcacheManager.add('student-last-seen-on:1', True)
+
+            student.update_last_seen_on(now=now, value=now)
+            student = db.get(key)
+
+            self.assertIsNone(student.last_seen_on)
+
 
 class StudentProfileDAOTestCase(actions.ExportTestBase):
 
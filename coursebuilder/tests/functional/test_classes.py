@@ -1243,6 +1243,8 @@ class InfrastructureTest(actions.TestBase):
 
             overall_score = course.get_overall_score(student)
             assert overall_score == int((1 * 10 + 3 * 30) / 40)
+            assert course.get_scores_and_overall(student) == (
+                student_scores, overall_score)
 
             actions.logout()
 
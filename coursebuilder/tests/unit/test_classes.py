@@ -19,6 +19,7 @@ __author__ = 'Pavel Simakov (psimakov@google.com)'
 
 import sys
 import unittest
+import urlparse
 import appengine_config
 from common import caching
 from common import xcontent
@@ -321,6 +322,34 @@ class InvokeExistingUnitTest(suite.TestBase):
         self.assertTrue(app_context_a != None)
         self.assertFalse(app_context_a == None)
 
+    def test_app_context_slug_and_canonicalize_url(self):
+        root = sites.ApplicationContext('course', '/', '/', 'ns_root', None)
+        self.assertEquals('/', root.slug_with_trailing_slash)
+        self.assertFalse(root.has_slug)
+        self.assertEquals('/preview', root.canonicalize_url('/preview'))
+
+        app_context = sites.ApplicationContext(
+            'course', '/slug_a', '/', 'ns_a', None)
+        self.assertEquals('/slug_a/', app_context.slug_with_trailing_slash)
+        self.assertTrue(app_context.has_slug)
+        self.assertEquals(
+            '/slug_a/preview', app_context.canonicalize_url('/preview'))
+        self.assertEquals(
+            '/slug_a/course', app_context.canonicalize_url('/slug_a/course'))
+        self.assertEquals(
+            'http://x.com/preview',
+            app_context.canonicalize_url('http://x.com/preview'))
+
+    def test_is_absolute_url_agrees_with_urlparse(self):
+        for url in [
+                'http://x.com/a', 'HTTPS://x.com:80/', 'mailto:a@b.com',
+                'javascript:void(0)', 'foo:', '/slug/course', 'course',
+                'localhost:8080', 'http:123', 'HTTP:123', 'https:123', '/a:b',
+                '?a=b:c', 'a b:c', '']:
+            self.assertEquals(
+                bool(urlparse.urlparse(url).scheme),
+                sites.ApplicationContext.is_absolute_url(url), url)
+
     def test_app_context_affinity(self):
         app_context_a = sites.ApplicationContext(
             'course', '/slug_a', '/', 'ns_a', None)